@@ -7,14 +7,14 @@ import sys
 import json
 import anthropic
 from mcp import ClientSession
-from mcp.client.sse import sse_client
+from mcp.client.streamable_http import streamablehttp_client
 from tabulate import tabulate
 
 # Load environment variables
 dotenv.load_dotenv()
 anthropic_api_key = os.getenv('ANTHROPIC_API_KEY')
 db_url = os.getenv('DATABASE_URL')
-pg_mcp_url = os.getenv('PG_MCP_URL', 'http://localhost:8000/sse')
+pg_mcp_url = os.getenv('PG_MCP_URL', 'http://localhost:8000/mcp')
 
 def clean_sql_query(sql_query):
     """
@@ -153,12 +153,12 @@ async def main():
     try:
         print(f"Connecting to MCP server at {pg_mcp_url}...")
         
-        # Create the SSE client context manager
-        async with sse_client(url=pg_mcp_url) as streams:
-            print("SSE streams established, creating session...")
+        # Create the streamable HTTP client context manager
+        async with streamablehttp_client(url=pg_mcp_url) as (read_stream, write_stream, _):
+            print("HTTP streams established, creating session...")
             
             # Create and initialize the MCP ClientSession
-            async with ClientSession(*streams) as session:
+            async with ClientSession(read_stream, write_stream) as session:
                 print("Session created, initializing...")
                 
                 # Initialize the connection
@@ -8,7 +8,7 @@ import codecs
 import sys
 import dotenv
 from mcp import ClientSession
-from mcp.client.sse import sse_client
+from mcp.client.streamable_http import streamablehttp_client
 from tabulate import tabulate
 from pydantic_ai import Agent
 from pydantic_ai.models.gemini import GeminiModel
@@ -19,7 +19,7 @@ from httpx import AsyncClient
 dotenv.load_dotenv()
 
 # Default values
-DEFAULT_MCP_URL = os.getenv("PG_MCP_URL", "http://localhost:8000/sse")
+DEFAULT_MCP_URL = os.getenv("PG_MCP_URL", "http://localhost:8000/mcp")
 DEFAULT_DB_URL = os.getenv("DATABASE_URL", "")
 DEFAULT_API_KEY = os.getenv("GEMINI_API_KEY", "")
 
@@ -40,8 +40,8 @@ class AgentCLI:
     async def initialize(self):
         """Initialize the session and connect to the database."""
         print(f"Connecting to MCP server at {self.mcp_url}...")
-        async with sse_client(url=self.mcp_url) as streams:
-            async with ClientSession(*streams) as self.session:
+        async with streamablehttp_client(url=self.mcp_url) as (read_stream, write_stream, _):
+            async with ClientSession(read_stream, write_stream) as self.session:
                 await self.session.initialize()
 
                 # Connect to database
@@ -4,20 +4,31 @@
 Ollama client for the PostgreSQL MCP server.
 Translates natural language queries to SQL using Ollama and executes them.
 """
+import argparse
 import asyncio
+import csv
 import os
+import re
+import sqlite3
 import sys
-import json
 import logging
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Optional, List, Tuple, Union
 
 import dotenv
 import httpx
+import orjson
 from mcp import ClientSession
-from mcp.client.sse import sse_client
+from mcp.client.streamable_http import streamablehttp_client
 from tabulate import tabulate
 
+try:
+    import uvloop
+except ImportError:  # uvloop is not available on Windows
+    uvloop = None
+
+from sql_cache import SQLCache, close_embedding_session
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -30,12 +41,81 @@ logger = logging.getLogger('ollama_cli')
 dotenv.load_dotenv()
 
 # Configuration with defaults
-MCP_URL = os.getenv('PG_MCP_URL', 'http://localhost:8000/sse')
+MCP_URL = os.getenv('PG_MCP_URL', 'http://localhost:8000/mcp')
 DB_URL = os.getenv('DATABASE_URL')
 OLLAMA_URL = os.getenv('OLLAMA_URL', 'http://localhost:11434')
 OLLAMA_MODEL = os.getenv('OLLAMA_MODEL')
 
-async def generate_sql_with_ollama(user_query: str, conn_id: str, session: ClientSession) -> Dict[str, Any]:
+# Result sets larger than this are streamed as TSV when --format is auto
+LARGE_RESULT_ROWS = 200
+OUTPUT_FORMATS = ["auto", "pretty", "plain", "tsv", "csv"]
+
+# Statement keywords and end markers used to find SQL in Ollama responses
+_SQL_KEYWORDS: Tuple[str, ...] = ("WITH", "SELECT", "CREATE", "INSERT", "UPDATE", "DELETE")
+_SQL_END_MARKERS: Tuple[str, ...] = ("\n\n", "```", ".\n")
+
+_SQL_KEYWORD_PATTERN = r"\b(?:" + "|".join(_SQL_KEYWORDS) + r")\b"
+_SQL_KEYWORD_RE = re.compile(_SQL_KEYWORD_PATTERN, re.IGNORECASE)
+
+# Matches either a fenced code block or a bare SQL statement running up to the
+# first end marker or the end of the text
+_SQL_EXTRACT_RE = re.compile(
+    r"```(?P<lang>sql\b)?\s*(?P<block>.*?)```"
+    r"|(?P<statement>" + _SQL_KEYWORD_PATTERN + r".*?)"
+    r"(?=" + "|".join(re.escape(marker) for marker in _SQL_END_MARKERS) + r"|\Z)",
+    re.DOTALL | re.IGNORECASE
+)
+
+# Shared Ollama HTTP client, created lazily so connections are kept alive across calls
+_ollama_client: Optional[httpx.AsyncClient] = None
+_ollama_client_lock = asyncio.Lock()
+
+
+async def get_ollama_client() -> httpx.AsyncClient:
+    """Return the shared Ollama HTTP client, creating it on first use."""
+    global _ollama_client
+    async with _ollama_client_lock:
+        if _ollama_client is None or _ollama_client.is_closed:
+            _ollama_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(300.0, connect=10.0),
+                limits=httpx.Limits(
+                    max_keepalive_connections=40,
+                    max_connections=100,
+                    keepalive_expiry=30.0
+                )
+            )
+        return _ollama_client
+
+
+async def close_ollama_client() -> None:
+    """Close the shared Ollama HTTP client if it was created."""
+    global _ollama_client
+    if _ollama_client is not None:
+        await _ollama_client.aclose()
+        _ollama_client = None
+
+
+_sql_cache: Optional[SQLCache] = None
+_sql_cache_unavailable = False
+
+
+def get_sql_cache() -> Optional[SQLCache]:
+    """
+    Return the shared semantic SQL cache, opening it on first use.
+
+    Returns None if the cache cannot be opened; the CLI then runs without it.
+    """
+    global _sql_cache, _sql_cache_unavailable
+    if _sql_cache is None and not _sql_cache_unavailable:
+        try:
+            _sql_cache = SQLCache()
+        except (sqlite3.Error, OSError) as e:
+            logger.warning("Semantic cache unavailable, continuing without it: %s", e)
+            _sql_cache_unavailable = True
+    return _sql_cache
+
+
+async def generate_sql_with_ollama(user_query: str, conn_id: str, session: ClientSession, use_cache: bool = True) -> Dict[str, Any]:
     """
     Generate SQL using Ollama with the server's generate_sql prompt.
 
@@ -43,15 +123,31 @@ async def generate_sql_with_ollama(user_query: str, conn_id: str, session: Clien
         user_query: Natural language query from the user
         conn_id: Database connection ID
         session: MCP client session
+        use_cache: If False, always ask Ollama instead of reusing cached SQL
 
     Returns:
         Dictionary with results containing:
         - success: Boolean indicating success or failure
         - sql: The extracted SQL query (if successful)
         - explanation: Human-readable explanation (if successful)
+        - cached: True if the SQL was served from the semantic cache
+        - skeleton: Query skeleton for remember_sql()/forget_sql() (if successful)
         - error: Error message (if failure)
     """
     try:
+        sql_cache = get_sql_cache()
+        cached_sql, skeleton = None, None
+        if sql_cache is not None:
+            cached_sql, skeleton = await sql_cache.lookup(conn_id, user_query, use_cached=use_cache)
+        if cached_sql:
+            return {
+                "success": True,
+                "sql": cached_sql,
+                "explanation": "SQL reused from the semantic cache",
+                "cached": True,
+                "skeleton": skeleton
+            }
+
         logger.info("Fetching SQL generation prompt from server")
         prompt_response = await session.get_prompt('generate_sql', {
             'conn_id': conn_id,
@@ -59,7 +155,7 @@ async def generate_sql_with_ollama(user_query: str, conn_id: str, session: Clien
         })
 
         if not hasattr(prompt_response, 'messages') or not prompt_response.messages:
-            logger.error(f"Invalid prompt response from server: {prompt_response}")
+            logger.error("Invalid prompt response from server: %s", prompt_response)
             return {
                 "success": False,
                 "error": "Invalid prompt response from server",
@@ -67,60 +163,60 @@ async def generate_sql_with_ollama(user_query: str, conn_id: str, session: Clien
             }
 
         # Concatenate all messages into a single prompt
-        prompt = "\n".join([
-            (msg.content.text if hasattr(msg.content, 'text') else str(msg.content))
+        prompt = "\n".join(
+            msg.content.text if getattr(msg.content, 'text', None) is not None else str(msg.content)
             for msg in prompt_response.messages
-        ])
+        )
 
-        logger.debug(f"Prompt sent to Ollama:\n{prompt}")
+        logger.debug("Prompt sent to Ollama:\n%s", prompt)
 
         # Call Ollama API
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            try:
-                logger.info(f"Sending request to Ollama API at {OLLAMA_URL}")
-                response = await client.post(
-                    f"{OLLAMA_URL}/api/generate",
-                    json={"model": OLLAMA_MODEL, "prompt": prompt, "stream": False}
-                )
-                response.raise_for_status()
-                data = response.json()
-                response_text = data.get('response', '')
-                logger.debug(f"Ollama raw response: {data}")
-
-            except httpx.HTTPStatusError as e:
-                logger.error(f"HTTP error from Ollama API: {e.response.status_code} - {e.response.text}")
-                return {
-                    "success": False,
-                    "error": f"Ollama API HTTP error: {e.response.status_code}",
-                    "details": e.response.text
-                }
-            except httpx.RequestError as e:
-                logger.error(f"Request error to Ollama API: {e}")
-                return {
-                    "success": False,
-                    "error": f"Ollama API connection error: {str(e)}"
-                }
-            except Exception as e:
-                logger.error(f"Exception calling Ollama API: {e}", exc_info=True)
-                return {
-                    "success": False,
-                    "error": f"Ollama API error: {str(e)}"
-                }
+        client = await get_ollama_client()
+        try:
+            logger.info("Sending request to Ollama API at %s", OLLAMA_URL)
+            response = await client.post(
+                f"{OLLAMA_URL}/api/generate",
+                content=orjson.dumps({"model": OLLAMA_MODEL, "prompt": prompt, "stream": False}),
+                headers={"Content-Type": "application/json"}
+            )
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+            response_text = data.get('response', '')
+            logger.debug("Ollama raw response: %s", data)
+
+        except httpx.HTTPStatusError as e:
+            logger.error("HTTP error from Ollama API: %s - %s", e.response.status_code, e.response.text)
+            return {
+                "success": False,
+                "error": f"Ollama API HTTP error: {e.response.status_code}",
+                "details": e.response.text
+            }
+        except httpx.RequestError as e:
+            logger.error("Request error to Ollama API: %s", e)
+            return {
+                "success": False,
+                "error": f"Ollama API connection error: {str(e)}"
+            }
+        except Exception as e:
+            logger.error("Exception calling Ollama API: %s", e, exc_info=True)
+            return {
+                "success": False,
+                "error": f"Ollama API error: {str(e)}"
+            }
 
         # Extract SQL query from response using multiple strategies
         sql_query = extract_sql_from_response(response_text)
 
         if not sql_query:
-            logger.error(f"Could not extract SQL from Ollama's response: {response_text}")
+            logger.error("Could not extract SQL from Ollama's response: %s", response_text)
             return {
                 "success": False,
                 "error": "Could not extract SQL from Ollama's response",
                 "response": response_text
             }
 
-        # Ensure SQL query ends with semicolon
-        sql_query = sql_query.strip()
-        if not sql_query.endswith(';'):
+        # Ensure SQL query ends with semicolon (extraction already strips whitespace)
+        if sql_query[-1:] != ';':
             sql_query += ';'
 
         logger.info("SQL query successfully generated")
@@ -128,11 +224,13 @@ async def generate_sql_with_ollama(user_query: str, conn_id: str, session: Clien
             "success": True,
             "sql": sql_query,
             "explanation": "SQL generated using Ollama",
-            "ollama_response": response_text
+            "ollama_response": response_text,
+            "cached": False,
+            "skeleton": skeleton
         }
 
     except Exception as e:
-        logger.error(f"Exception in generate_sql_with_ollama: {e}", exc_info=True)
+        logger.error("Exception in generate_sql_with_ollama: %s", e, exc_info=True)
         return {
             "success": False,
             "error": f"Error: {str(e)}"
@@ -141,7 +239,10 @@ async def generate_sql_with_ollama(user_query: str, conn_id: str, session: Clien
 
 def extract_sql_from_response(response_text: str) -> Optional[str]:
     """
-    Extract SQL query from Ollama's response text using multiple strategies.
+    Extract SQL query from Ollama's response text in a single pass.
+
+    Code blocks tagged as sql, or untagged blocks containing SQL keywords, take
+    precedence over the first bare SQL statement found in the text.
 
     Args:
         response_text: The raw text response from Ollama
@@ -149,46 +250,21 @@ def extract_sql_from_response(response_text: str) -> Optional[str]:
     Returns:
         Extracted SQL query or None if no SQL could be extracted
     """
-    sql_query = None
-
-    # Strategy 1: Extract SQL from code blocks
-    if "```sql" in response_text and "```" in response_text.split("```sql", 1)[1]:
-        sql_start = response_text.find("```sql") + 6
-        remaining_text = response_text[sql_start:]
-        sql_end = remaining_text.find("```")
-        if sql_end > 0:
-            sql_query = remaining_text[:sql_end].strip()
-            return sql_query
-
-    # Strategy 2: Try with just markdown code block
-    if "```" in response_text:
-        code_blocks = response_text.split("```")
-        if len(code_blocks) >= 3:  # At least one complete code block
-            for i in range(1, len(code_blocks), 2):  # Check each code block
-                block = code_blocks[i].strip()
-                if block.startswith("sql\n"):  # Remove sql language marker if present
-                    block = block[4:].strip()
-
-                # Check if block contains SQL keywords
-                for keyword in ["SELECT", "WITH", "CREATE", "INSERT", "UPDATE", "DELETE"]:
-                    if keyword in block.upper():
-                        return block
-
-    # Strategy 3: Look for SQL keywords directly in text
-    if not sql_query:
-        for keyword in ["WITH", "SELECT", "CREATE", "INSERT", "UPDATE", "DELETE"]:
-            if keyword in response_text.upper():
-                keyword_pos = response_text.upper().find(keyword)
-                sql_query = response_text[keyword_pos:].strip()
-
-                # Find end of SQL statement
-                for end_marker in ["\n\n", "```", ".\n"]:
-                    if end_marker in sql_query:
-                        sql_query = sql_query[:sql_query.find(end_marker)].strip()
-
-                return sql_query
-
-    return None
+    statement = None
+
+    for match in _SQL_EXTRACT_RE.finditer(response_text):
+        block = match.group('block')
+        if block is None:
+            if statement is None:
+                statement = match.group('statement').strip()
+            continue
+
+        block = block.strip()
+        # Accept sql-tagged blocks, or untagged blocks that contain SQL keywords
+        if match.group('lang') or _SQL_KEYWORD_RE.search(block):
+            return block
+
+    return statement
 
 async def connect_to_database(session: ClientSession) -> Optional[str]:
     """
@@ -201,7 +277,7 @@ async def connect_to_database(session: ClientSession) -> Optional[str]:
         Connection ID if successful, None otherwise
     """
     try:
-        logger.info(f"Registering connection with server...")
+        logger.info("Registering connection with server...")
         connect_result = await session.call_tool(
             "connect", {"connection_string": DB_URL}
         )
@@ -215,20 +291,34 @@ async def connect_to_database(session: ClientSession) -> Optional[str]:
             logger.error("Connection response missing text content")
             return None
 
-        result_data = json.loads(content.text)
+        result_data = orjson.loads(content.text)
         conn_id = result_data.get('conn_id')
         if not conn_id:
             logger.error("Connection ID not found in response")
             return None
 
-        logger.info(f"Connection registered with ID: {conn_id}")
+        logger.info("Connection registered with ID: %s", conn_id)
         return conn_id
 
     except Exception as e:
-        logger.error(f"Error connecting to database: {e}", exc_info=True)
+        logger.error("Error connecting to database: %s", e, exc_info=True)
         return None
 
 
+def remember_sql(conn_id: str, response_data: Dict[str, Any]) -> None:
+    """Cache freshly generated SQL once it has executed successfully."""
+    sql_cache = get_sql_cache()
+    if sql_cache is not None and response_data.get("skeleton") and not response_data.get("cached"):
+        sql_cache.store(conn_id, response_data["skeleton"], response_data["sql"])
+
+
+def forget_sql(conn_id: str, response_data: Dict[str, Any]) -> None:
+    """Evict cached SQL that failed to execute so Ollama is asked again next time."""
+    sql_cache = get_sql_cache()
+    if sql_cache is not None and response_data.get("cached"):
+        sql_cache.evict(conn_id, response_data["skeleton"])
+
+
 async def execute_query(session: ClientSession, sql_query: str, conn_id: str) -> List[Dict[str, Any]]:
     """
     Execute SQL query and parse results.
@@ -240,31 +330,88 @@ async def execute_query(session: ClientSession, sql_query: str, conn_id: str) ->
 
     Returns:
         List of result rows as dictionaries
+
+    Raises:
+        RuntimeError: If the server reports that the query failed
     """
     logger.info("Executing SQL query...")
     result = await session.call_tool(
         "pg_query", {"query": sql_query, "conn_id": conn_id}
     )
 
+    if getattr(result, 'isError', False):
+        message = " ".join(getattr(item, 'text', '') for item in result.content or [])
+        raise RuntimeError(f"Query failed: {message or 'unknown error'}")
+
     if not hasattr(result, 'content') or not result.content:
         logger.warning("Query returned no content")
         return []
 
+    # The server returns the whole result set as a single JSON array
+    if len(result.content) == 1:
+        text = getattr(result.content[0], 'text', None)
+        if not text:
+            return []
+        try:
+            row_data = orjson.loads(text)
+        except orjson.JSONDecodeError:
+            logger.warning("Could not parse result: %s", text)
+            return []
+        return row_data if isinstance(row_data, list) else [row_data]
+
+    # Fall back to one content item per row
     query_results = []
     for item in result.content:
         if hasattr(item, 'text') and item.text:
             try:
-                row_data = json.loads(item.text)
+                row_data = orjson.loads(item.text)
                 if isinstance(row_data, list):
                     query_results.extend(row_data)
                 else:
                     query_results.append(row_data)
-            except json.JSONDecodeError:
-                logger.warning(f"Could not parse result: {item.text}")
+            except orjson.JSONDecodeError:
+                logger.warning("Could not parse result: %s", item.text)
 
     return query_results
 
 
+def print_results(query_results: List[Dict[str, Any]], output_format: str = "auto") -> None:
+    """
+    Print query results in the requested format.
+
+    The pretty and plain formats are rendered with tabulate, which measures every
+    cell to align columns. The tsv and csv formats are written row by row without
+    building the whole table in memory, and auto picks tsv for large results.
+
+    Args:
+        query_results: List of result rows as dictionaries
+        output_format: One of OUTPUT_FORMATS
+    """
+    if output_format == "auto":
+        output_format = "tsv" if len(query_results) > LARGE_RESULT_ROWS else "pretty"
+
+    if output_format in ("tsv", "csv"):
+        writer = csv.DictWriter(
+            sys.stdout,
+            fieldnames=list(query_results[0].keys()),
+            delimiter="\t" if output_format == "tsv" else ",",
+            lineterminator="\n"
+        )
+        writer.writeheader()
+        writer.writerows(query_results)
+    else:
+        print(tabulate(query_results, headers="keys", tablefmt=output_format))
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    """Parse command line arguments; --help is handled by print_help()."""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("query", nargs="?")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="auto")
+    parser.add_argument("--no-cache", dest="use_cache", action="store_false")
+    return parser.parse_args(argv)
+
+
 async def main() -> None:
     """Main function that coordinates the entire workflow."""
     # Validate required environment variables
@@ -275,20 +422,21 @@ async def main() -> None:
         sys.exit(1)
 
     # Check command line arguments
-    if len(sys.argv) < 2:
-        print("Usage: python ollama_cli.py 'your natural language query'")
+    args = parse_args(sys.argv[1:])
+    if not args.query:
+        print("Usage: python ollama_cli.py 'your natural language query' [--format FORMAT] [--no-cache]")
         print("Example: python ollama_cli.py 'Show me the top 5 customers'")
         sys.exit(1)
 
-    user_query = sys.argv[1]
+    user_query = args.query
     print(f"Processing query: {user_query}")
 
     try:
-        logger.info(f"Connecting to MCP server at {MCP_URL}...")
+        logger.info("Connecting to MCP server at %s...", MCP_URL)
         print(f"Connecting to MCP server at {MCP_URL}...")
 
-        async with sse_client(url=MCP_URL) as streams:
-            async with ClientSession(*streams) as session:
+        async with streamablehttp_client(url=MCP_URL) as (read_stream, write_stream, _):
+            async with ClientSession(read_stream, write_stream) as session:
                 # Initialize session
                 await session.initialize()
                 logger.info("Connection initialized!")
@@ -301,68 +449,92 @@ async def main() -> None:
                     print("Error: Failed to connect to database")
                     sys.exit(1)
 
-                # Generate SQL query
-                print("Generating SQL query with Ollama...")
-                response_data = await generate_sql_with_ollama(user_query, conn_id, session)
-
-                # Handle SQL generation failure
-                if not response_data.get("success"):
-                    error_msg = response_data.get("error", "Unknown error")
-                    logger.error(f"SQL generation failed: {error_msg}")
-                    print(f"ERROR: SQL generation failed: {error_msg}")
-
-                    # Print debug information if available
-                    for key in ["response", "details", "raw"]:
-                        if key in response_data:
-                            logger.debug(f"{key}: {response_data[key]}")
-
-                    # Ensure clean disconnect before exiting
-                    await session.call_tool("disconnect", {"conn_id": conn_id})
-                    sys.exit(1)
-
-                # Extract and show SQL query
-                sql_query = response_data.get("sql", "")
-                explanation = response_data.get("explanation", "")
-
-                if explanation:
-                    print(f"\nExplanation:\n------------\n{explanation}")
-
-                print(f"\nGenerated SQL query:\n------------------\n{sql_query}\n------------------\n")
-
-                if not sql_query:
-                    logger.error("No SQL query was generated")
-                    print("No SQL query was generated. Exiting.")
-                    await session.call_tool("disconnect", {"conn_id": conn_id})
-                    sys.exit(1)
-
-                # Execute the query
-                query_results = await execute_query(session, sql_query, conn_id)
-
-                # Display results
-                print("\nQuery Results:\n==============")
-                if query_results:
-                    # Use pretty table format
-                    table = tabulate(query_results, headers="keys", tablefmt="pretty")
-                    print(table)
-                    print(f"\nTotal rows: {len(query_results)}")
-                else:
-                    print("Query executed successfully but returned no results.")
-
-                # Clean disconnect
-                logger.info("Disconnecting from database...")
-                print("Disconnecting from database...")
-                await session.call_tool("disconnect", {"conn_id": conn_id})
-                print("Successfully disconnected.")
+                # Disconnect on every failure path; a successful run disconnects
+                # while results are rendered
+                disconnect_pending = True
+                disconnect_task = None
+                try:
+                    # Generate SQL query
+                    print("Generating SQL query with Ollama...")
+                    response_data = await generate_sql_with_ollama(user_query, conn_id, session, args.use_cache)
+
+                    # Handle SQL generation failure
+                    if not response_data.get("success"):
+                        error_msg = response_data.get("error", "Unknown error")
+                        logger.error("SQL generation failed: %s", error_msg)
+                        print(f"ERROR: SQL generation failed: {error_msg}")
+
+                        # Print debug information if available
+                        for key in ["response", "details", "raw"]:
+                            if key in response_data:
+                                logger.debug("%s: %s", key, response_data[key])
+
+                        sys.exit(1)
+
+                    # Extract and show SQL query
+                    sql_query = response_data.get("sql", "")
+                    explanation = response_data.get("explanation", "")
+
+                    if explanation:
+                        print(f"\nExplanation:\n------------\n{explanation}")
+
+                    print(f"\nGenerated SQL query:\n------------------\n{sql_query}\n------------------\n")
+
+                    if not sql_query:
+                        logger.error("No SQL query was generated")
+                        print("No SQL query was generated. Exiting.")
+                        sys.exit(1)
+
+                    # Execute the query; only SQL that runs is kept in the cache
+                    try:
+                        query_results = await execute_query(session, sql_query, conn_id)
+                    except Exception:
+                        forget_sql(conn_id, response_data)
+                        raise
+                    remember_sql(conn_id, response_data)
+
+                    # Display results, overlapping the disconnect round trip with rendering.
+                    # The disconnect runs as its own task so a rendering failure (e.g. a
+                    # broken pipe from `| head`) cannot cancel it
+                    print("\nQuery Results:\n==============")
+                    logger.info("Disconnecting from database...")
+                    disconnect_task = asyncio.create_task(
+                        session.call_tool("disconnect", {"conn_id": conn_id})
+                    )
+                    if query_results:
+                        await asyncio.to_thread(print_results, query_results, args.format)
+                    await disconnect_task
+                    disconnect_pending = False
+
+                    if query_results:
+                        print(f"\nTotal rows: {len(query_results)}")
+                    else:
+                        print("Query executed successfully but returned no results.")
+
+                    print("Successfully disconnected.")
+                finally:
+                    if disconnect_pending:
+                        if disconnect_task is None:
+                            await session.call_tool("disconnect", {"conn_id": conn_id})
+                        else:
+                            # Let the in-flight disconnect finish; the error that got us
+                            # here is the one reported
+                            await asyncio.gather(disconnect_task, return_exceptions=True)
 
     except httpx.ConnectError as e:
-        logger.error(f"Connection error: {e}")
+        logger.error("Connection error: %s", e)
         print(f"ERROR: Could not connect to MCP server at {MCP_URL}")
         print(f"Please make sure the server is running and accessible.")
         sys.exit(1)
     except Exception as e:
-        logger.error(f"Exception in main: {type(e).__name__}: {e}", exc_info=True)
+        logger.error("Exception in main: %s: %s", type(e).__name__, e, exc_info=True)
         print(f"ERROR: {type(e).__name__}: {e}")
         sys.exit(1)
+    finally:
+        await close_ollama_client()
+        await close_embedding_session()
+        if _sql_cache is not None:
+            _sql_cache.close()
 
 def print_help() -> None:
     """Print CLI usage instructions."""
@@ -376,10 +548,17 @@ Required environment variables:
 - DATABASE_URL: PostgreSQL connection string
 - OLLAMA_MODEL: Ollama model name (default: llama3)
 - OLLAMA_URL: URL to Ollama API (default: http://localhost:11434)
-- PG_MCP_URL: URL to MCP server (default: http://localhost:8000/sse)
+- OLLAMA_EMBED_MODEL: Ollama embedding model for similar-query cache hits (optional)
+- SQL_CACHE_PATH: SQLite file for cached SQL (default: ~/.cache/pg-mcp/sql_cache.db)
+- PG_MCP_URL: URL to MCP server (default: http://localhost:8000/mcp)
 
 Usage:
-  python ollama_cli.py 'your natural language query'
+  python ollama_cli.py 'your natural language query' [--format FORMAT] [--no-cache]
+
+Options:
+  --format  Result format: auto, pretty, plain, tsv or csv (default: auto,
+            which uses tsv for results over 200 rows and pretty otherwise)
+  --no-cache  Always ask Ollama; the new SQL replaces any cached entry once it runs
 
 Example:
   python ollama_cli.py 'Show me the top 5 customers by total purchases'
@@ -396,7 +575,7 @@ if __name__ == "__main__":
         os.environ["PYTHONASYNCIODEBUG"] = "1"
 
     try:
-        asyncio.run(main())
+        asyncio.run(main(), loop_factory=uvloop.new_event_loop if uvloop else None)
     except KeyboardInterrupt:
         print("\nOperation cancelled by user")
         sys.exit(0)
@@ -0,0 +1,412 @@
+# example-clients/sql_cache.py
+"""
+Semantic cache for natural language to SQL translations.
+
+Queries are reduced to a skeleton (lowercased, stop-words dropped, literal values
+replaced by typed slots) so that structurally identical questions such as
+"sales for 'Apple' in 2025" and "sales for 'Huawei' in 2023" share one cached
+SQL template. Exact skeleton matches are a hash lookup; when an embedding model
+is configured, near-identical skeletons with the same connective, direction and
+aggregate words in the same order are matched by cosine similarity.
+Embedding requests issued close together are batched into one /api/embed call.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import aiohttp
+import numpy as np
+import orjson
+
+logger = logging.getLogger('ollama_cli.cache')
+
+OLLAMA_URL = os.getenv('OLLAMA_URL', 'http://localhost:11434')
+EMBED_MODEL = os.getenv('OLLAMA_EMBED_MODEL')
+CACHE_PATH = Path(os.getenv('SQL_CACHE_PATH', Path.home() / '.cache' / 'pg-mcp' / 'sql_cache.db'))
+
+# Minimum cosine similarity for a cached skeleton to be reused
+SIMILARITY_THRESHOLD = 0.92
+
+# Concurrent embedding requests arriving within this window share one Ollama call
+EMBED_BATCH_WINDOW = 0.02
+
+NUMBER_SLOT = '<num>'
+TEXT_SLOT = '<text>'
+
+_TOKEN_RE = re.compile(r"'[^']*'|\"[^\"]*\"|\d+(?:\.\d+)?|\w+")
+_TEMPLATE_SLOT_RE = re.compile(r"\{\{slot:(\d+)\}\}")
+# A whole SQL string literal, or a bare number that is not part of an identifier or $n parameter
+_SQL_LITERAL_RE = re.compile(r"'((?:[^']|'')*)'|(?<![\w.$])(\d+(?:\.\d+)?)(?![\w.])")
+
+# Filler words only; logical (and/or) and directional (from/to/by/for) words
+# change the meaning of the SQL and must stay in the skeleton
+_STOP_WORDS = frozenset({
+    'a', 'an', 'are', 'as', 'at', 'be', 'can', 'did', 'do', 'does', 'get',
+    'give', 'has', 'have', 'how', 'i', 'in', 'is', 'it', 'list', 'me', 'of',
+    'on', 'please', 'show', 'tell', 'that', 'the', 'their', 'there', 'these',
+    'this', 'those', 'us', 'was', 'were', 'what', 'which', 'who', 'with', 'you',
+})
+
+# Words that decide how slots relate (connectives, direction, aggregation,
+# comparison, ordering); a similarity match must keep them in the same order
+_STRUCTURE_WORDS = frozenset({
+    'above', 'after', 'and', 'asc', 'ascending', 'average', 'avg', 'before',
+    'below', 'between', 'bottom', 'by', 'count', 'desc', 'descending', 'each',
+    'except', 'excluding', 'fewer', 'first', 'for', 'from', 'greater', 'highest',
+    'last', 'least', 'less', 'lowest', 'max', 'maximum', 'mean', 'median', 'min',
+    'minimum', 'more', 'most', 'no', 'not', 'or', 'over', 'per', 'since', 'sum',
+    'than', 'to', 'top', 'total', 'under', 'until', 'without',
+})
+
+
+@dataclass
+class QuerySkeleton:
+    """A natural language query reduced to its structure plus extracted values."""
+    text: str
+    entities: List[str]
+    slots: Tuple[str, ...]
+    embedding: Optional[np.ndarray] = field(default=None, repr=False)
+    # Hash of the cache entry that served this query, if any
+    matched_key: Optional[str] = None
+
+    @property
+    def key(self) -> str:
+        return hashlib.blake2b(self.text.encode('utf-8'), digest_size=16).hexdigest()
+
+    @property
+    def structure(self) -> Tuple[str, ...]:
+        return skeleton_structure(self.text)
+
+
+def skeleton_structure(skeleton_text: str) -> Tuple[str, ...]:
+    """Return the slots and structure words of a skeleton, in order."""
+    return tuple(
+        token for token in skeleton_text.split()
+        if token in _STRUCTURE_WORDS or token in (NUMBER_SLOT, TEXT_SLOT)
+    )
+
+
+def build_skeleton(user_query: str) -> QuerySkeleton:
+    """
+    Reduce a natural language query to a skeleton string.
+
+    Quoted strings, numbers and capitalized words after the first token are
+    treated as entities and replaced by a typed slot; remaining words are
+    lowercased and stop-words are dropped.
+
+    Args:
+        user_query: Natural language query from the user
+
+    Returns:
+        QuerySkeleton with the skeleton text and the extracted entity values
+    """
+    tokens = []
+    entities = []
+    slots = []
+
+    for position, match in enumerate(_TOKEN_RE.finditer(user_query)):
+        token = match.group(0)
+        if token[0] in "'\"":
+            slot, value = TEXT_SLOT, token[1:-1]
+        elif token[0].isdigit():
+            slot, value = NUMBER_SLOT, token
+        elif position > 0 and token[0].isupper():
+            slot, value = TEXT_SLOT, token
+        else:
+            lowered = token.lower()
+            if lowered not in _STOP_WORDS:
+                tokens.append(lowered)
+            continue
+
+        tokens.append(slot)
+        slots.append(slot)
+        entities.append(value)
+
+    return QuerySkeleton(" ".join(tokens), entities, tuple(slots))
+
+
+def make_template(sql: str, entities: List[str]) -> Optional[str]:
+    """
+    Replace entity values in generated SQL with numbered slots.
+
+    Only whole SQL literals are templated: a bare number token, or an entire
+    '...' string. Returns None when the SQL cannot be safely templated, i.e. an
+    entity is repeated, does not appear as a literal exactly once, or is part
+    of a larger literal. A literal such as '2022-01-01' was derived from the
+    entity, and values derived alongside it would stay hard-coded.
+    """
+    if not entities:
+        return sql
+    if len(set(entities)) != len(entities):
+        return None
+
+    indexes = {entity: index for index, entity in enumerate(entities)}
+    counts = [0] * len(entities)
+    derived = False
+
+    def to_slot(match):
+        nonlocal derived
+        string_value, number = match.group(1), match.group(2)
+        value = number if string_value is None else string_value.replace("''", "'")
+
+        index = indexes.get(value)
+        if index is None:
+            if any(entity in value for entity in entities):
+                derived = True
+            return match.group(0)
+
+        counts[index] += 1
+        slot = f"{{{{slot:{index}}}}}"
+        return slot if string_value is None else f"'{slot}'"
+
+    template = _SQL_LITERAL_RE.sub(to_slot, sql)
+    if derived or any(count != 1 for count in counts):
+        return None
+    return template
+
+
+def fill_template(template: str, entities: List[str]) -> str:
+    """Substitute entity values into the numbered slots of a SQL template."""
+    return _TEMPLATE_SLOT_RE.sub(
+        lambda match: entities[int(match.group(1))].replace("'", "''"),
+        template
+    )
+
+
+class EmbeddingBatcher:
+    """
+    Coalesces embedding requests into batched calls to Ollama's /api/embed.
+
+    A single queued request is sent immediately. When several are already
+    waiting, the batch stays open for EMBED_BATCH_WINDOW seconds to collect more.
+    One aiohttp session is used for the lifetime of the batcher.
+    """
+
+    def __init__(self, model: str, window: float = EMBED_BATCH_WINDOW):
+        self._model = model
+        self._window = window
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def embed(self, text: str) -> Optional[np.ndarray]:
+        """Queue text for embedding and wait for its vector."""
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            # A lone request (the CLI's one query per process) is sent right away;
+            # the window only applies when other requests are already waiting
+            if not self._queue.empty():
+                await asyncio.sleep(self._window)
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            try:
+                vectors = await self._post([text for text, _ in batch])
+            except Exception as e:
+                logger.warning("Could not embed query skeletons: %s", e)
+                vectors = [None] * len(batch)
+
+            # Every waiter must be resolved, even if Ollama returned too few vectors
+            if len(vectors) != len(batch):
+                logger.warning("Expected %d embeddings from Ollama, got %d", len(batch), len(vectors))
+                vectors = [None] * len(batch)
+
+            for (_, future), vector in zip(batch, vectors):
+                if not future.done():
+                    future.set_result(vector)
+
+    async def _post(self, texts: List[str]) -> List[np.ndarray]:
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=60.0),
+                json_serialize=lambda obj: orjson.dumps(obj).decode()
+            )
+
+        async with self._session.post(
+            f"{OLLAMA_URL}/api/embed",
+            json={"model": self._model, "input": texts}
+        ) as response:
+            response.raise_for_status()
+            data = await response.json(loads=orjson.loads)
+
+        # L2-normalize once here so cosine similarity is a plain dot product
+        vectors = np.asarray(data['embeddings'], dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors /= np.where(norms == 0, 1.0, norms)
+        return list(vectors)
+
+    async def close(self) -> None:
+        """Stop the batching worker and close the HTTP session."""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+_batcher: Optional[EmbeddingBatcher] = EmbeddingBatcher(EMBED_MODEL) if EMBED_MODEL else None
+
+
+async def embed_text(text: str) -> Optional[np.ndarray]:
+    """
+    Embed text with the configured Ollama embedding model.
+
+    Vectors are L2-normalized. Returns None when no embedding model is
+    configured or the request fails, in which case only exact skeleton
+    matches are served from the cache.
+    """
+    if _batcher is None:
+        return None
+    return await _batcher.embed(text)
+
+
+async def close_embedding_session() -> None:
+    """Release the embedding HTTP session; call once at shutdown."""
+    if _batcher is not None:
+        await _batcher.close()
+
+
+class SQLCache:
+    """SQLite-backed cache of SQL templates keyed by connection and query skeleton."""
+
+    def __init__(self, path: Path = CACHE_PATH):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS sql_cache (
+                conn_id TEXT NOT NULL,
+                skeleton_hash TEXT NOT NULL,
+                skeleton TEXT NOT NULL,
+                slots TEXT NOT NULL,
+                sql_template TEXT NOT NULL,
+                embedding BLOB,
+                PRIMARY KEY (conn_id, skeleton_hash)
+            )
+        """)
+        self._db.commit()
+
+    async def lookup(self, conn_id: str, user_query: str, use_cached: bool = True) -> Tuple[Optional[str], QuerySkeleton]:
+        """
+        Look up cached SQL for a natural language query.
+
+        Args:
+            conn_id: Database connection ID the SQL was generated for
+            user_query: Natural language query from the user
+            use_cached: If False, only build the skeleton and its embedding so
+                freshly generated SQL can replace any cached entry
+
+        Returns:
+            Tuple of the cached SQL (or None on a miss) and the query skeleton,
+            which should be passed to store() once the generated SQL has run
+            successfully, or to evict() if cached SQL fails
+        """
+        skeleton = build_skeleton(user_query)
+        try:
+            return await self._lookup(conn_id, skeleton, use_cached)
+        except sqlite3.Error as e:
+            logger.warning("Semantic cache lookup failed, continuing without it: %s", e)
+            return None, skeleton
+
+    async def _lookup(self, conn_id: str, skeleton: QuerySkeleton, use_cached: bool) -> Tuple[Optional[str], QuerySkeleton]:
+        if use_cached:
+            row = self._db.execute(
+                "SELECT sql_template FROM sql_cache WHERE conn_id = ? AND skeleton_hash = ?",
+                (conn_id, skeleton.key)
+            ).fetchone()
+            if row:
+                logger.info("Semantic cache hit on exact query skeleton")
+                skeleton.matched_key = skeleton.key
+                return fill_template(row[0], skeleton.entities), skeleton
+
+        skeleton.embedding = await embed_text(skeleton.text)
+        if skeleton.embedding is None or not use_cached:
+            return None, skeleton
+
+        rows = self._db.execute(
+            """
+            SELECT skeleton_hash, sql_template, embedding, skeleton FROM sql_cache
+            WHERE conn_id = ? AND slots = ? AND length(embedding) = ?
+            """,
+            (conn_id, " ".join(skeleton.slots), skeleton.embedding.nbytes)
+        ).fetchall()
+        # Embeddings barely separate "from <text> to <text>" from "to <text> from <text>"
+        # or "average" from "total", so only skeletons with the same structure qualify
+        structure = skeleton.structure
+        rows = [row for row in rows if skeleton_structure(row[3]) == structure]
+        if not rows:
+            return None, skeleton
+
+        # Embeddings are stored unit-length, so one matrix-vector product over
+        # the stacked (N, d) candidates gives every cosine similarity
+        matrix = np.frombuffer(b"".join(row[2] for row in rows), dtype=np.float32)
+        scores = matrix.reshape(len(rows), -1) @ skeleton.embedding
+        best = int(np.argmax(scores))
+        best_score = float(scores[best])
+
+        if best_score >= SIMILARITY_THRESHOLD:
+            logger.info("Semantic cache hit with similarity %.3f", best_score)
+            skeleton.matched_key = rows[best][0]
+            return fill_template(rows[best][1], skeleton.entities), skeleton
+
+        return None, skeleton
+
+    def store(self, conn_id: str, skeleton: QuerySkeleton, sql: str) -> bool:
+        """
+        Cache generated SQL for a query skeleton; call only after it ran successfully.
+
+        Returns:
+            True if the SQL was cached, False if it could not be templated or written
+        """
+        sql_template = make_template(sql, skeleton.entities)
+        if sql_template is None:
+            logger.debug("Generated SQL does not use each query entity as a whole literal; not caching")
+            return False
+
+        embedding = None
+        if skeleton.embedding is not None:
+            embedding = skeleton.embedding.tobytes()
+
+        try:
+            self._db.execute(
+                "INSERT OR REPLACE INTO sql_cache VALUES (?, ?, ?, ?, ?, ?)",
+                (conn_id, skeleton.key, skeleton.text, " ".join(skeleton.slots), sql_template, embedding)
+            )
+            self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning("Could not write to semantic cache: %s", e)
+            return False
+        return True
+
+    def evict(self, conn_id: str, skeleton: QuerySkeleton) -> None:
+        """Remove the cache entry that served a query, e.g. after its SQL failed."""
+        if skeleton.matched_key is None:
+            return
+
+        logger.info("Evicting cached SQL that failed to execute")
+        try:
+            self._db.execute(
+                "DELETE FROM sql_cache WHERE conn_id = ? AND skeleton_hash = ?",
+                (conn_id, skeleton.matched_key)
+            )
+            self._db.commit()
+        except sqlite3.Error as e:
+            logger.warning("Could not evict semantic cache entry: %s", e)
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        self._db.close()
@@ -4,12 +4,12 @@ import httpx
 import json
 import sys
 from mcp import ClientSession
-from mcp.client.sse import sse_client
+from mcp.client.streamable_http import streamablehttp_client
 
 async def run(connection_string: str | None):
     """Download a comprhensive database schema from the MCP server."""
     # Assuming your server is running on localhost:8000
-    server_url = "http://localhost:8000/sse"  
+    server_url = "http://localhost:8000/mcp"  
     
     try:
         print(f"Connecting to MCP server at {server_url}...")
@@ -20,12 +20,12 @@ async def run(connection_string: str | None):
             masked_conn_string = clean_connection[:10] + "..." if len(clean_connection) > 10 else clean_connection
             print(f"Using database connection: {masked_conn_string}")
         
-        # Create the SSE client context manager
-        async with sse_client(url=server_url) as streams:
-            print("SSE streams established, creating session...")
+        # Create the streamable HTTP client context manager
+        async with streamablehttp_client(url=server_url) as (read_stream, write_stream, _):
+            print("HTTP streams established, creating session...")
             
             # Create and initialize the MCP ClientSession
-            async with ClientSession(*streams) as session:
+            async with ClientSession(read_stream, write_stream) as session:
                 print("Session created, initializing...")
                 # Initialize the connection
                 await session.initialize()
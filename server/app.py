@@ -7,34 +7,14 @@ from server.logging_config import (
     get_logger,
     configure_uvicorn_logging,
 )
-from server.config import mcp
-
-# Tool / resource registration
-from server.resources.schema import register_schema_resources
-from server.resources.data import register_data_resources
-from server.resources.extensions import register_extension_resources
-from server.tools.connection import register_connection_tools
-from server.tools.query import register_query_tools
-from server.tools.viz import register_viz_tools
-from server.tools.schema import register_schema_tools
-from server.prompts.natural_language import register_natural_language_prompts
-from server.prompts.data_visualization import register_data_visualization_prompts
+from server.config import mcp, register_components
 
 # ---- Logging setup ----
 log_level = os.environ.get("LOG_LEVEL", "DEBUG")
 configure_logging(level=log_level)
 logger = get_logger("app")
 
-logger.info("Registering resources and tools")
-register_schema_resources()
-register_extension_resources()
-register_data_resources()
-register_connection_tools()
-register_query_tools()
-register_viz_tools()
-register_natural_language_prompts()
-register_data_visualization_prompts()
-register_schema_tools()
+register_components()
 
 # ---- HTTP JSON / streamable transport ----
 # This exposes the MCP server as a stateless HTTP endpoint at /mcp
@@ -51,4 +31,6 @@ if __name__ == "__main__":
         port=8000,
         log_level=log_level.lower(),
         log_config=uvicorn_log_config,
+        # "auto" runs on uvloop when it is installed, falling back to asyncio
+        loop="auto",
     )
\ No newline at end of file
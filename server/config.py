@@ -9,14 +9,51 @@ logger = get_logger("instance")
 global_db = Database()
 logger.info("Global database manager initialized")
 
-# IMPORTANT: stateless_http=True enables the HTTP transport
+# Stateless HTTP with plain JSON responses: no per-session state or SSE streams,
+# so the global DB manager below is shared by every request
 mcp = FastMCP(
     name="pg-mcp-server",
-    debug=True,
+    debug=False,
     stateless_http=True,
+    json_response=True,
     dependencies=["asyncpg", "mcp"],
 )
 
 # Attach shared state once
 mcp.state = {"db": global_db}
-logger.info("FastMCP instance initialized with global DB in state")
\ No newline at end of file
+logger.info("FastMCP instance initialized with global DB in state")
+
+_registered = False
+
+def register_components():
+    """
+    Register all resources, tools and prompts with the shared MCP instance.
+    
+    Safe to call more than once; registration only happens on the first call.
+    """
+    global _registered
+    if _registered:
+        return
+
+    # Imported here because these modules import mcp from this module
+    from server.resources.schema import register_schema_resources
+    from server.resources.data import register_data_resources
+    from server.resources.extensions import register_extension_resources
+    from server.tools.connection import register_connection_tools
+    from server.tools.query import register_query_tools
+    from server.tools.viz import register_viz_tools
+    from server.tools.schema import register_schema_tools
+    from server.prompts.natural_language import register_natural_language_prompts
+    from server.prompts.data_visualization import register_data_visualization_prompts
+
+    logger.info("Registering resources and tools")
+    register_schema_resources()
+    register_extension_resources()
+    register_data_resources()
+    register_connection_tools()
+    register_query_tools()
+    register_viz_tools()
+    register_natural_language_prompts()
+    register_data_visualization_prompts()
+    register_schema_tools()
+    _registered = True
\ No newline at end of file
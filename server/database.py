@@ -67,6 +67,23 @@ class Database:
         
         return conn_id
     
+    def deregister(self, conn_id):
+        """
+        Remove a connection ID and its connection string from the registry.
+        
+        Both maps are updated without yielding to the event loop, so concurrent
+        callers cannot both deregister the same connection.
+        
+        Args:
+            conn_id: Connection ID to remove
+            
+        Returns:
+            bool: True if the connection ID was registered
+        """
+        connection_string = self._connection_map.pop(conn_id, None)
+        self._reverse_map.pop(connection_string, None)
+        return connection_string is not None
+    
     def get_connection_string(self, conn_id):
         """Get the actual connection string for a connection ID."""
         if conn_id not in self._connection_map:
@@ -89,8 +106,15 @@ class Database:
                 min_size=2,
                 max_size=10,
                 command_timeout=60.0,
-                # Read-only mode
-                server_settings={"default_transaction_read_only": "true"}
+                server_settings={
+                    # Read-only mode
+                    "default_transaction_read_only": "true",
+                    # Only JIT-compile expensive analytical plans
+                    "jit": "on",
+                    "jit_above_cost": "100000",
+                    "jit_inline_above_cost": "500000",
+                    "jit_optimize_above_cost": "500000",
+                }
             )
         
         return self
@@ -116,14 +140,15 @@ class Database:
                     If None, close all connection pools.
         """
         if conn_id:
-            if conn_id in self._pools:
+            # Drop the pool before awaiting close so a failed close cannot leave it behind
+            pool = self._pools.pop(conn_id, None)
+            if pool is not None:
                 logger.info(f"Closing database connection pool for connection ID {conn_id}")
-                await self._pools[conn_id].close()
-                del self._pools[conn_id]
+                await pool.close()
         else:
             # Close all connection pools
             logger.info("Closing all database connection pools")
             for id, pool in list(self._pools.items()):
                 logger.info(f"Closing connection pool for ID {id}")
-                await pool.close()
-                del self._pools[id]
\ No newline at end of file
+                self._pools.pop(id, None)
+                await pool.close()
\ No newline at end of file
@@ -38,15 +38,12 @@ def register_connection_tools():
         logger.info(f"[disconnect] called for conn_id={conn_id}")
         db = mcp.state["db"]
 
-        if conn_id not in db._connection_map:
+        if not db.deregister(conn_id):
             logger.warning(f"Attempted to disconnect unknown connection ID: {conn_id}")
             return {"success": False, "error": "Unknown connection ID"}
 
         try:
             await db.close(conn_id)
-            connection_string = db._connection_map.pop(conn_id, None)
-            if connection_string in db._reverse_map:
-                del db._reverse_map[connection_string]
             logger.info(f"Successfully disconnected database connection with ID: {conn_id}")
             return {"success": True}
         except Exception as e:
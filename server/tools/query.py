@@ -1,10 +1,36 @@
 # server/tools/query.py
+import orjson
+import pydantic_core
+from datetime import timedelta
+from decimal import Decimal
 from server.config import mcp
 from mcp.server.fastmcp import Context
 from server.logging_config import get_logger
 
 logger = get_logger("pg-mcp.tools.query")
 
+def result_serializer(obj):
+    """
+    orjson default for query result values orjson cannot encode natively.
+    
+    Values are encoded the way FastMCP's pydantic serialization did before
+    results were returned as one payload, so no precision or type is lost.
+    """
+    if isinstance(obj, Decimal):
+        # A float would round large or high-precision numeric values
+        return str(obj)
+    if isinstance(obj, timedelta):
+        # ISO 8601 duration, e.g. P1D
+        return pydantic_core.to_jsonable_python(obj)
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        data = bytes(obj)
+        try:
+            return data.decode("utf-8")
+        except UnicodeDecodeError:
+            # Binary bytea values use PostgreSQL's hex output format
+            return "\\x" + data.hex()
+    return str(obj)
+
 async def execute_query(query: str, conn_id: str, params=None, ctx=Context):
     """
     Execute a read-only SQL query against the PostgreSQL database.
@@ -59,10 +85,13 @@ def register_query_tools():
             params: Parameters for the query (optional)
             
         Returns:
-            Query results as a list of dictionaries
+            Query results as a single JSON array of row objects
         """
         # Execute the query using the connection ID 
-        return await execute_query(query, conn_id, params)
+        records = await execute_query(query, conn_id, params)
+
+        # Serialize the whole result set as one payload rather than one content item per row
+        return orjson.dumps(records, default=result_serializer).decode()
         
     @mcp.tool()
     async def pg_explain(query: str, conn_id: str, params=None):
@@ -3,6 +3,23 @@ from server.logging_config import get_logger
 
 logger = get_logger("pg-mcp.tools.schema")
 
+# Query text is kept constant so asyncpg's per-connection statement cache
+# prepares each query once per pooled connection and reuses it afterwards
+LIST_TABLES_QUERY = """
+    SELECT table_name
+    FROM information_schema.tables
+    WHERE table_schema = 'public'
+    ORDER BY table_name
+"""
+
+DESCRIBE_TABLE_QUERY = """
+    SELECT column_name, data_type
+    FROM information_schema.columns
+    WHERE table_schema = 'public'
+      AND table_name = $1
+    ORDER BY ordinal_position
+"""
+
 def register_schema_tools():
     @mcp.tool()
     async def pg_list_tables(conn_id: str):
@@ -11,12 +28,7 @@ def register_schema_tools():
         """
         db = mcp.state["db"]
         async with db.get_connection(conn_id) as conn:
-            rows = await conn.fetch("""
-                SELECT table_name
-                FROM information_schema.tables
-                WHERE table_schema = 'public'
-                ORDER BY table_name
-            """)
+            rows = await conn.fetch(LIST_TABLES_QUERY)
             return [r["table_name"] for r in rows]
 
     @mcp.tool()
@@ -26,11 +38,5 @@ def register_schema_tools():
         """
         db = mcp.state["db"]
         async with db.get_connection(conn_id) as conn:
-            rows = await conn.fetch("""
-                SELECT column_name, data_type
-                FROM information_schema.columns
-                WHERE table_schema = 'public'
-                  AND table_name = $1
-                ORDER BY ordinal_position
-            """, table)
+            rows = await conn.fetch(DESCRIBE_TABLE_QUERY, table)
             return [{"column": r["column_name"], "type": r["data_type"]} for r in rows]
\ No newline at end of file
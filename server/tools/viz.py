@@ -1,5 +1,5 @@
 # server/tools/viz.py
-import json
+import orjson
 from datetime import date, datetime
 from decimal import Decimal
 from sqlglot import parse_one, exp
@@ -96,7 +96,7 @@ async def get_query_metadata(conn_id, sql_query):
         except Exception as e:
             logger.error(f"Row count failed: {e}")
 
-    return json.dumps(metadata, indent=2, default=default_serializer)
+    return orjson.dumps(metadata, option=orjson.OPT_INDENT_2, default=default_serializer).decode()
 
 def register_viz_tools():
     """Register visualization tools with the MCP server."""
@@ -0,0 +1,159 @@
+# tests/test_sql_cache.py
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "example-clients"))
+
+import numpy as np
+import sql_cache
+from sql_cache import SQLCache, build_skeleton, fill_template, make_template
+
+
+def test_skeleton_replaces_entities_with_typed_slots():
+    skeleton = build_skeleton("Show total sales for 'Apple' in 2025")
+    assert skeleton.text == "total sales for <text> <num>"
+    assert skeleton.entities == ["Apple", "2025"]
+
+
+def test_skeleton_keeps_logical_connectives():
+    either = build_skeleton("customers in 'NY' or 'LA'")
+    both = build_skeleton("customers in 'NY' and 'LA'")
+    assert either.key != both.key
+
+
+def test_skeleton_keeps_direction_words():
+    outbound = build_skeleton("flights from 'NYC' to 'LAX'")
+    inbound = build_skeleton("flights to 'NYC' from 'LAX'")
+    assert outbound.key != inbound.key
+
+
+def test_template_round_trip():
+    template = make_template("SELECT * FROM sales WHERE brand = 'Apple' AND year = 2025;", ["Apple", "2025"])
+    assert fill_template(template, ["O'Neil", "2023"]) == (
+        "SELECT * FROM sales WHERE brand = 'O''Neil' AND year = 2023;"
+    )
+
+
+def test_template_rejects_entity_matching_more_than_once():
+    assert make_template("SELECT * FROM t ORDER BY ROUND(x, 2) DESC LIMIT 2;", ["2"]) is None
+
+
+def test_template_ignores_positional_parameters():
+    template = make_template("SELECT * FROM t WHERE id = $1 LIMIT 1;", ["1"])
+    assert template == "SELECT * FROM t WHERE id = $1 LIMIT {{slot:0}};"
+
+
+def test_template_rejects_entity_inside_larger_literal():
+    sql = "SELECT * FROM customers WHERE joined >= '2022-01-01' AND joined < '2023-01-01';"
+    assert make_template(sql, ["2022"]) is None
+
+
+def test_template_rejects_entity_inside_larger_string():
+    assert make_template("SELECT * FROM t WHERE name LIKE 'Apple%';", ["Apple"]) is None
+
+
+def test_template_rejects_missing_entity():
+    assert make_template("SELECT * FROM t;", ["Apple"]) is None
+
+
+def test_cache_serves_and_evicts_entries(tmp_path, monkeypatch):
+    # Exact skeleton matches only; no embedding calls to Ollama
+    monkeypatch.setattr(sql_cache, "_batcher", None)
+    cache = SQLCache(tmp_path / "sql_cache.db")
+
+    cached_sql, skeleton = asyncio.run(cache.lookup("conn", "sales for 'Apple' in 2025"))
+    assert cached_sql is None
+    assert cache.store("conn", skeleton, "SELECT * FROM sales WHERE brand = 'Apple' AND year = 2025;")
+
+    cached_sql, skeleton = asyncio.run(cache.lookup("conn", "sales for 'Huawei' in 2023"))
+    assert cached_sql == "SELECT * FROM sales WHERE brand = 'Huawei' AND year = 2023;"
+
+    cache.evict("conn", skeleton)
+    cached_sql, _ = asyncio.run(cache.lookup("conn", "sales for 'Huawei' in 2023"))
+    assert cached_sql is None
+    cache.close()
+
+
+def _stub_embedder(monkeypatch):
+    # Every skeleton embeds to the same unit vector, i.e. similarity 1.0
+    async def embed_text(text):
+        return np.ones(4, dtype=np.float32) / 2
+
+    monkeypatch.setattr(sql_cache, "embed_text", embed_text)
+
+
+def test_similarity_hit_requires_same_structure(tmp_path, monkeypatch):
+    _stub_embedder(monkeypatch)
+    cache = SQLCache(tmp_path / "sql_cache.db")
+
+    _, skeleton = asyncio.run(cache.lookup("conn", "flights from 'NYC' to 'LAX'"))
+    assert cache.store("conn", skeleton, "SELECT * FROM flights WHERE origin = 'NYC' AND dest = 'LAX';")
+
+    cached_sql, _ = asyncio.run(cache.lookup("conn", "flights to 'SFO' from 'BOS'"))
+    assert cached_sql is None
+
+    cached_sql, _ = asyncio.run(cache.lookup("conn", "trips from 'BOS' to 'SFO'"))
+    assert cached_sql == "SELECT * FROM flights WHERE origin = 'BOS' AND dest = 'SFO';"
+    cache.close()
+
+
+def test_similarity_hit_requires_same_aggregate(tmp_path, monkeypatch):
+    _stub_embedder(monkeypatch)
+    cache = SQLCache(tmp_path / "sql_cache.db")
+
+    _, skeleton = asyncio.run(cache.lookup("conn", "total sales for 'Apple'"))
+    assert cache.store("conn", skeleton, "SELECT sum(amount) FROM sales WHERE brand = 'Apple';")
+
+    cached_sql, _ = asyncio.run(cache.lookup("conn", "average sales for 'Huawei'"))
+    assert cached_sql is None
+    cache.close()
+
+
+def test_cache_errors_do_not_propagate(tmp_path, monkeypatch):
+    monkeypatch.setattr(sql_cache, "_batcher", None)
+    cache = SQLCache(tmp_path / "sql_cache.db")
+    cache.close()
+
+    cached_sql, skeleton = asyncio.run(cache.lookup("conn", "sales for 'Apple' in 2025"))
+    assert cached_sql is None
+    assert not cache.store("conn", skeleton, "SELECT * FROM sales WHERE brand = 'Apple' AND year = 2025;")
+
+
+def test_batcher_resolves_all_waiters_on_short_response(monkeypatch):
+    batcher = sql_cache.EmbeddingBatcher("model", window=0)
+
+    async def short_response(texts):
+        return [np.ones(3, dtype=np.float32)]
+
+    monkeypatch.setattr(batcher, "_post", short_response)
+
+    async def embed_both():
+        try:
+            return await asyncio.wait_for(
+                asyncio.gather(batcher.embed("first"), batcher.embed("second")), timeout=1.0
+            )
+        finally:
+            await batcher.close()
+
+    assert asyncio.run(embed_both()) == [None, None]
+
+
+def test_batcher_sends_lone_request_without_waiting(monkeypatch):
+    batcher = sql_cache.EmbeddingBatcher("model", window=10.0)
+    posted = []
+
+    async def post(texts):
+        posted.append(texts)
+        return [np.ones(3, dtype=np.float32) for _ in texts]
+
+    monkeypatch.setattr(batcher, "_post", post)
+
+    async def embed():
+        try:
+            return await asyncio.wait_for(batcher.embed("only"), timeout=1.0)
+        finally:
+            await batcher.close()
+
+    assert asyncio.run(embed()) is not None
+    assert posted == [["only"]]